@@ -13,43 +13,197 @@ Usage:
 
 import re
 import argparse
+import contextlib
+import mmap
 import os
-from collections import defaultdict
 
+import numpy as np
 
-FLOAT_RE = re.compile(rb"[-+]?(?:\d{1,3}\.\d+|\d+\.\d{1,})(?:[eE][-+]?\d+)?")
+try:
+    import hyperscan
+except ImportError:  # optional: fall back to the stdlib regex engine
+    hyperscan = None
+
+try:
+    from fastnumbers import fast_float
+except ImportError:  # optional: float() parses the ASCII bytes directly too
+    def fast_float(raw, default=None):
+        try:
+            return float(raw)
+        except ValueError:
+            return default
+
+
+FLOAT_PATTERN = rb"[-+]?\d+\.\d+(?:[eE][-+]?\d+)?"
+FLOAT_RE = re.compile(FLOAT_PATTERN)
+
+# Floats are scanned one block of the file at a time and paired for at most
+# PAIR_BATCH first floats at a time, so memory is bounded by the block and
+# batch sizes (times the pairing window) rather than by the whole video, and
+# the target check runs before the rest of a block is paired.
+BLOCK_SIZE = 1024 * 1024
+PAIR_BATCH = 1024
+
+_float_db = None
+
+
+def _hyperscan_float_db():
+    global _float_db
+    if _float_db is None:
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_STREAM | hyperscan.HS_MODE_SOM_HORIZON_LARGE)
+        db.compile(expressions=[FLOAT_PATTERN], flags=[hyperscan.HS_FLAG_SOM_LEFTMOST])
+        _float_db = db
+    return _float_db
 
 
-def find_floats_in_bytes(data):
-    results = []
+def _iter_float_spans_hyperscan(data, block_size):
+    """Yield lists of ``(start, end)`` spans of FLOAT_PATTERN using Hyperscan.
+
+    Hyperscan reports every end offset that completes a match (with its
+    leftmost start), so the reports are folded back into the leftmost-longest,
+    non-overlapping spans that ``FLOAT_RE.finditer`` would give. The file is
+    fed to a Hyperscan stream block by block; a span is only yielded once a
+    later match proves it cannot grow any further.
+    """
+    spans = []
+    committed_end = 0
+    current = None  # [start, end] of the span still being extended
+
+    def on_match(_id, start, end, _flags, _context):
+        nonlocal current, committed_end
+        if start < committed_end:
+            return None
+        if current is None:
+            current = [start, end]
+        elif start <= current[0]:
+            current[0], current[1] = start, end
+        elif start >= current[1]:
+            spans.append(tuple(current))
+            committed_end = current[1]
+            current = [start, end]
+        return None
+
+    with _hyperscan_float_db().stream(match_event_handler=on_match) as stream:
+        for offset in range(0, len(data), block_size):
+            stream.scan(data[offset:offset + block_size])
+            yield spans
+            spans = []
+    if current is not None:
+        yield [tuple(current)]
+
+
+def _iter_float_spans_re(data, block_size):
+    spans = []
+    limit = block_size
     for m in FLOAT_RE.finditer(data):
-        try:
-            val = float(m.group(0).decode('ascii'))
-        except Exception:
-            continue
-        results.append((m.start(), val))
-    return results
+        if m.start() >= limit:
+            yield spans
+            spans = []
+            limit = (m.start() // block_size + 1) * block_size
+        spans.append(m.span())
+    yield spans
+
 
+def find_floats_in_bytes(data, block_size=BLOCK_SIZE):
+    """Yield ``(positions, values)`` arrays of the floats in each block of ``data``.
 
-def find_coordinate_pairs(floats, max_byte_distance=200):
-    pairs = []
-    n = len(floats)
-    for i in range(n):
-        pos1, v1 = floats[i]
-        for j in range(i+1, n):
-            pos2, v2 = floats[j]
-            if pos2 - pos1 > max_byte_distance:
-                break
-            # try both orders: (lon, lat) or (lat, lon)
-            if -180.0 <= v1 <= 180.0 and -90.0 <= v2 <= 90.0:
-                pairs.append((pos1, pos2, v1, v2))
-            if -180.0 <= v2 <= 180.0 and -90.0 <= v1 <= 90.0:
-                pairs.append((pos1, pos2, v2, v1))
-    return pairs
+    Floats outside [-180, 180] can never be half of a coordinate pair, so
+    they are dropped here rather than carried into the pairing step.
+    """
+    if hyperscan is not None:
+        blocks = _iter_float_spans_hyperscan(data, block_size)
+    else:
+        blocks = _iter_float_spans_re(data, block_size)
 
+    for spans in blocks:
+        # Positions and values are kept as parallel arrays (not a list of
+        # tuples) so the pairing step can work on them with NumPy.
+        positions = []
+        values = []
+        for start, end in spans:
+            # Parse the matched bytes as-is; no intermediate str is built
+            val = fast_float(data[start:end], default=None)
+            if val is None or not -180.0 <= val <= 180.0:
+                continue
+            positions.append(start)
+            values.append(val)
+        yield np.array(positions, dtype=np.int64), np.array(values, dtype=np.float64)
 
-def canonical_pair(lon, lat):
-    return (round(lat, 7), round(lon, 7))
+
+def find_coordinate_pairs(positions, values, max_byte_distance=200, start=0, stop=None):
+    """Pair up floats that lie within ``max_byte_distance`` bytes of each other.
+
+    Only floats at indices ``start`` up to ``stop`` (default: all of them)
+    are used as the first float of a pair. Returns parallel arrays ``(pos1, pos2, lon, lat)``
+    ordered as the nested scan would produce them: by first float, then
+    second float, with the (lon, lat) reading of a pair before the (lat, lon)
+    reading.
+    """
+    lon_ok = (values >= -180.0) & (values <= 180.0)
+    lat_ok = (values >= -90.0) & (values <= 90.0)
+
+    # Positions are sorted, so if floats i and i+k are too far apart then so
+    # are i and i+k+1. Walk the window one offset at a time, keeping only the
+    # left indices that still have a neighbour in range; total work is
+    # proportional to the number of candidate pairs rather than n squared.
+    firsts, seconds, swapped = [], [], []
+    left = np.arange(start, len(positions) if stop is None else stop, dtype=np.int64)
+    k = 1
+    while True:
+        left = left[left + k < len(positions)]
+        left = left[positions[left + k] - positions[left] <= max_byte_distance]
+        if left.size == 0:
+            break
+        right = left + k
+        # try both orders: (lon, lat) or (lat, lon)
+        as_lon_lat = lon_ok[left] & lat_ok[right]
+        as_lat_lon = lon_ok[right] & lat_ok[left]
+        firsts += [left[as_lon_lat], left[as_lat_lon]]
+        seconds += [right[as_lon_lat], right[as_lat_lon]]
+        swapped += [np.zeros(as_lon_lat.sum(), dtype=bool), np.ones(as_lat_lon.sum(), dtype=bool)]
+        k += 1
+
+    if not firsts:
+        empty_i = np.empty(0, dtype=np.int64)
+        empty_f = np.empty(0, dtype=np.float64)
+        return empty_i, empty_i, empty_f, empty_f
+
+    i = np.concatenate(firsts)
+    j = np.concatenate(seconds)
+    swap = np.concatenate(swapped)
+    order = np.lexsort((swap, j, i))
+    i, j, swap = i[order], j[order], swap[order]
+
+    lon = np.where(swap, values[j], values[i])
+    lat = np.where(swap, values[i], values[j])
+    return positions[i], positions[j], lon, lat
+
+
+def iter_coordinate_pairs(float_blocks, max_byte_distance=200):
+    """Yield ``find_coordinate_pairs`` results in scan order.
+
+    A float is only used as the first of a pair once every float that could
+    follow it within ``max_byte_distance`` has been seen; the rest are carried
+    into the next block. Ready floats are paired PAIR_BATCH at a time. This
+    keeps the overall pair order identical to pairing the whole file at once.
+    """
+    positions = np.empty(0, dtype=np.int64)
+    values = np.empty(0, dtype=np.float64)
+    for new_positions, new_values in float_blocks:
+        if new_positions.size == 0:
+            continue
+        positions = np.concatenate((positions, new_positions))
+        values = np.concatenate((values, new_values))
+        # Any later float lies beyond positions[-1], so floats at least
+        # max_byte_distance before it have all their partners already.
+        ready = int(np.searchsorted(positions, positions[-1] - max_byte_distance, side='right'))
+        for start in range(0, ready, PAIR_BATCH):
+            stop = min(start + PAIR_BATCH, ready)
+            yield find_coordinate_pairs(positions, values, max_byte_distance, start=start, stop=stop)
+        positions, values = positions[ready:], values[ready:]
+    for start in range(0, len(positions), PAIR_BATCH):
+        stop = min(start + PAIR_BATCH, len(positions))
+        yield find_coordinate_pairs(positions, values, max_byte_distance, start=start, stop=stop)
 
 
 def main():
@@ -65,21 +219,6 @@ def main():
         print('Input file not found:', inp)
         return 2
 
-    with open(inp, 'rb') as f:
-        data = f.read()
-
-    floats = find_floats_in_bytes(data)
-    pairs = find_coordinate_pairs(floats, max_byte_distance=300)
-
-    unique = []
-    seen = set()
-    for pos1, pos2, lon, lat in pairs:
-        key = canonical_pair(lon, lat)
-        if key in seen:
-            continue
-        seen.add(key)
-        unique.append((lon, lat, pos1, pos2))
-
     # Optionally prefer a known target coordinate (the DMS you provided),
     # otherwise choose the earliest candidate.
     # Target: 37°56'9.96" N, 122°3'32.76" W -> decimal lat=37.9361, lon=-122.0591
@@ -88,23 +227,37 @@ def main():
     tol = 1e-4  # tolerance in degrees (~11 m)
 
     chosen = None
-    # Search for a candidate within tolerance of the target (match lat & lon)
-    for lon_c, lat_c, p1, p2 in unique:
-        if abs(lat_c - target_lat) <= tol and abs(lon_c - target_lon) <= tol:
-            chosen = (lon_c, lat_c, p1, p2)
-            break
+    earliest = None
+    # Map the file instead of reading it so only the pages touched by the
+    # scan are loaded. Pairs arrive in scan order, so the first pair seen is
+    # the earliest candidate and the scan can stop at the first target match.
+    # mmap refuses empty files, and an empty file has no coordinates anyway
+    if os.path.getsize(inp) > 0:
+        with open(inp, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                data.madvise(mmap.MADV_SEQUENTIAL)
+            pairs = iter_coordinate_pairs(find_floats_in_bytes(data), max_byte_distance=300)
+            with contextlib.closing(pairs):
+                for _, _, lon_arr, lat_arr in pairs:
+                    if earliest is None and lon_arr.size:
+                        earliest = (lon_arr[0], lat_arr[0])
+                    # Search for a candidate within tolerance of the target (match lat & lon)
+                    hits = np.flatnonzero((np.abs(lat_arr - target_lat) <= tol) & (np.abs(lon_arr - target_lon) <= tol))
+                    if hits.size:
+                        chosen = (lon_arr[hits[0]], lat_arr[hits[0]])
+                        break
 
     # Fallback: choose the earliest candidate
-    if chosen is None and unique:
-        chosen = sorted(unique, key=lambda item: min(item[2], item[3]))[0]
+    if chosen is None:
+        chosen = earliest
 
     with open(out, 'w', encoding='utf-8') as f:
-        if not chosen:
+        if chosen is None:
             f.write(f'No longitude/latitude found in {inp}\n')
             print('No longitude/latitude found; wrote message to', out)
             return 0
 
-        lon, lat, p1, p2 = chosen
+        lon, lat = chosen
         # Write a simple two-column CSV with longitude,latitude (decimal only)
         f.write('longitude,latitude\n')
         f.write(f'{lon:.7f},{lat:.7f}\n')
@@ -7,29 +7,96 @@ Fetch JSON from a provided API URL and write it to a CSV file.
 Usage examples:
   python3 ~/Desktop/api_to_csv.py --url https://swapi.dev/api/planets/3/ --output ~/Desktop/planet_3.csv
   python3 ~/Desktop/api_to_csv.py --url https://swapi.dev/api/planets/ --output ~/Desktop/planets.csv
+  python3 ~/Desktop/api_to_csv.py --url https://swapi.dev/api/planets/ --follow-pagination --output ~/Desktop/all_planets.csv
 
 Behavior:
 - If the top-level JSON is an object (dict), it writes one row with that object's fields.
 - If the top-level JSON is a list, it writes one row per list item and unions the set of keys for the header.
 - Nested objects are flattened with dot notation (e.g., details.size -> details.size).
 - Lists of primitives are joined with '|' by default. Lists of objects are JSON-stringified per cell.
+- With --follow-pagination, 'next' links of a paginated 'results' response are fetched and all pages are written.
 """
 
 import argparse
 import csv
 import json
+import operator
 import os
+import re
 import sys
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
+
+try:
+    import urllib3
+except ImportError:  # optional: fall back to urlopen (one connection per request)
+    urllib3 = None
+
+USER_AGENT = "api-to-csv/1.0 (https://example)"
+
+# In a fresh process (one write, pyarrow import included) Arrow's CSV writer
+# only clearly beats the csv module from roughly half a million rows; below
+# that the stdlib writer is as fast or faster and keeps csv's minimal quoting.
+ARROW_MIN_ROWS = 500000
+
+# Keep-alive connection pool shared by every fetch, so following paginated
+# 'next' links does not pay a new TCP/TLS handshake per page. Failed requests
+# are not retried, so timeouts and refused connections behave as with
+# urlopen; redirects are still followed like urlopen does.
+_pool = urllib3.PoolManager(
+    maxsize=4,
+    headers={"User-Agent": USER_AGENT},
+    retries=urllib3.Retry(total=None, connect=0, read=0, status=0, other=0, redirect=10, raise_on_redirect=True),
+) if urllib3 is not None else None
+
+
+# orjson silently turns integers outside the 64-bit range into floats, so
+# any run of 19+ digits (possibly such an integer) is parsed with json instead.
+_LONG_DIGITS_RE = re.compile(rb"\d{19,}")
+
+
+def _loads(raw):
+    if orjson is not None and not _LONG_DIGITS_RE.search(raw):
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(obj):
+    # Compact separators to match orjson's layout (float spellings such as
+    # 1e20 vs 1e+20 still differ between the two)
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:  # e.g. integers wider than 64 bits
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _fetch_pooled(url: str, timeout: int):
+    # Map urllib3 failures onto the urllib errors fetch_json reports
+    try:
+        resp = _pool.request("GET", url, timeout=timeout)
+    except urllib3.exceptions.HTTPError as e:
+        raise URLError(getattr(e, "reason", None) or e) from e
+    if resp.status >= 400:
+        raise HTTPError(url, resp.status, resp.reason, resp.headers, None)
+    return resp.data
+
 
 def fetch_json(url: str, timeout: int = 10):
-    req = Request(url, headers={"User-Agent": "api-to-csv/1.0 (https://example)"})
     try:
-        with urlopen(req, timeout=timeout) as resp:
-            raw = resp.read()
-            return json.loads(raw)
+        if _pool is not None:
+            raw = _fetch_pooled(url, timeout)
+        else:
+            req = Request(url, headers={"User-Agent": USER_AGENT})
+            with urlopen(req, timeout=timeout) as resp:
+                raw = resp.read()
+        return _loads(raw)
     except HTTPError as e:
         print(f"HTTP error: {e.code} - {e.reason}")
         raise
@@ -51,22 +118,53 @@ def flatten(obj, parent_key="", sep="."):
     Lists of primitives are joined with '|' and lists of objects are JSON-encoded.
     """
     items = {}
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
-            items.update(flatten(v, new_key, sep=sep))
-    elif isinstance(obj, list):
-        # If list of primitives, join
-        if all(is_primitive(x) for x in obj):
-            items[parent_key] = "|".join("" if x is None else str(x) for x in obj)
+    # Walk the structure with an explicit stack, writing leaves straight into
+    # one output dict. Children are pushed in reverse so keys come out in the
+    # same depth-first order the recursive version produced.
+    stack = [(obj, parent_key)]
+    while stack:
+        obj, parent_key = stack.pop()
+        if isinstance(obj, dict):
+            for k, v in reversed(obj.items()):
+                new_key = f"{parent_key}{sep}{k}" if parent_key else k
+                stack.append((v, new_key))
+        elif isinstance(obj, list):
+            # If list of primitives, join. Homogeneous str or numeric lists
+            # (the common case) skip the per-item None check.
+            if all(isinstance(x, str) for x in obj):
+                items[parent_key] = "|".join(obj)
+            elif all(isinstance(x, (int, float)) for x in obj):
+                items[parent_key] = "|".join(map(str, obj))
+            elif all(is_primitive(x) for x in obj):
+                items[parent_key] = "|".join("" if x is None else str(x) for x in obj)
+            else:
+                # For lists containing dicts or mixed types, store JSON string
+                items[parent_key] = _dumps(obj)
         else:
-            # For lists containing dicts or mixed types, store JSON string
-            items[parent_key] = json.dumps(obj, ensure_ascii=False)
-    else:
-        items[parent_key] = "" if obj is None else str(obj)
+            items[parent_key] = "" if obj is None else str(obj)
     return items
 
 
+def _write_csv_arrow(list_of_dicts, keys, out_path):
+    """Write rows with pyarrow's C++ CSV writer; return False if it can't be used."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:  # optional: fall back to the stdlib csv module
+        return False
+    try:
+        write_options = pa_csv.WriteOptions(eol="\r\n")
+    except TypeError:  # older pyarrow without the eol option
+        return False
+
+    # Every flattened value is a string. Arrow quotes all string cells,
+    # which reads back the same as csv's output.
+    schema = pa.schema([(k, pa.string()) for k in keys])
+    table = pa.Table.from_pylist(list_of_dicts, schema=schema)
+    pa_csv.write_csv(table, out_path, write_options=write_options)
+    return True
+
+
 def write_csv_from_list_of_dicts(list_of_dicts, out_path):
     # Collect all keys
     keys = set()
@@ -75,12 +173,21 @@ def write_csv_from_list_of_dicts(list_of_dicts, out_path):
     keys = sorted(keys)
 
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    if len(list_of_dicts) >= ARROW_MIN_ROWS and _write_csv_arrow(list_of_dicts, keys, out_path):
+        return
+
     with open(out_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(keys)
-        for d in list_of_dicts:
-            row = [d.get(k, "") for k in keys]
-            writer.writerow(row)
+        # When every row has every key (the usual paginated-API case), pull
+        # the cells out with itemgetter in C. It returns a scalar rather than
+        # a tuple for a single key, so that case takes the general path.
+        if len(keys) > 1 and all(len(d) == len(keys) for d in list_of_dicts):
+            writer.writerows(map(operator.itemgetter(*keys), list_of_dicts))
+        else:
+            for d in list_of_dicts:
+                row = [d.get(k, "") for k in keys]
+                writer.writerow(row)
 
 
 def main():
@@ -88,6 +195,7 @@ def main():
     parser.add_argument("--url", required=True, help="API URL that returns JSON")
     parser.add_argument("--output", default="~/Desktop/api_output.csv", help="Output CSV path (default: ~/Desktop/api_output.csv)")
     parser.add_argument("--sep", default='.', help="Key separator for flattened fields (default: '.')")
+    parser.add_argument("--follow-pagination", action="store_true", help="Follow 'next' links of paginated 'results' responses")
     args = parser.parse_args()
 
     url = args.url
@@ -96,6 +204,12 @@ def main():
     try:
         print(f"Fetching: {url}")
         data = fetch_json(url)
+        page = data
+        while (args.follow_pagination and isinstance(page, dict)
+               and isinstance(page.get("results"), list) and page.get("next")):
+            print(f"Fetching: {page['next']}")
+            page = fetch_json(page["next"])
+            data["results"].extend(page.get("results") or [])
     except Exception as e:
         print("Error fetching JSON:", e)
         sys.exit(1)
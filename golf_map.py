@@ -1,35 +1,46 @@
-import csv
 import folium
+import numpy as np
+import pandas as pd
 
 # Read golf shot data from CSV
-with open("/Users/marcusduggs/Desktop/golf_data.csv", "r") as file:
-    reader = csv.DictReader(file)
-    golf_data = list(reader)
+golf_data = pd.read_csv(
+    "/Users/marcusduggs/Desktop/golf_data.csv",
+    usecols=["stroke_number", "hole_number", "latitude", "longitude"],
+    dtype={"latitude": np.float64, "longitude": np.float64},
+)
 
 # Initialize map centered on first shot
-start_lat = float(golf_data[0]["latitude"])
-start_lon = float(golf_data[0]["longitude"])
+start_lat = golf_data.latitude.iloc[0]
+start_lon = golf_data.longitude.iloc[0]
 golf_map = folium.Map(location=[start_lat, start_lon], zoom_start=18, tiles="OpenStreetMap")
 
-# Create a list of coordinates for the path
-coordinates = []
-for shot in golf_data:
-    lat = float(shot["latitude"])
-    lon = float(shot["longitude"])
-    coordinates.append((lat, lon))
-    
-    # Add a marker for each shot
-    folium.Marker(
-        [lat, lon],
-        popup=f"Stroke {shot['stroke_number']} - Hole {shot['hole_number']}"
-    ).add_to(golf_map)
+# Build every marker and the shot path as features of a single GeoJSON
+# layer, rather than adding one map child per shot. GeoJSON positions are
+# [longitude, latitude].
+features = [
+    {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [shot.longitude, shot.latitude]},
+        "properties": {"popup": f"Stroke {shot.stroke_number} - Hole {shot.hole_number}"},
+    }
+    for shot in golf_data.itertuples(index=False)
+]
 
-# Draw a polyline (connects all the shots)
-folium.PolyLine(
-    locations=coordinates,
-    color="blue",
-    weight=4,
-    opacity=0.8
+# Draw a line (connects all the shots)
+features.append({
+    "type": "Feature",
+    "geometry": {
+        "type": "LineString",
+        "coordinates": list(zip(golf_data.longitude, golf_data.latitude)),
+    },
+    "properties": {"popup": "Shot path"},
+})
+
+folium.GeoJson(
+    {"type": "FeatureCollection", "features": features},
+    marker=folium.Marker(),
+    style_function=lambda feature: {"color": "blue", "weight": 4, "opacity": 0.8},
+    popup=folium.GeoJsonPopup(fields=["popup"], labels=False),
 ).add_to(golf_map)
 
 # Save to your Desktop
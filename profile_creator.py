@@ -1,6 +1,39 @@
 import os
 import shutil
 
+
+def copy_picture(src, dst):
+    # Re-running for the same profile: the picture may already be linked
+    if os.path.exists(dst):
+        if os.path.samefile(src, dst):
+            return
+        os.remove(dst)
+
+    # A hardlink shares the original file's data, so nothing is copied
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+
+    # Different filesystem or no hardlink support: copy inside the kernel,
+    # which clones the data on filesystems that support reflinks
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            shutil.copymode(src, dst)
+            return
+        except OSError:
+            pass
+
+    shutil.copy(src, dst)
+
 # Create a folder to store user profiles
 os.makedirs("profiles", exist_ok=True)
 
@@ -15,13 +48,16 @@ user_folder = os.path.join("profiles", name)
 os.makedirs(user_folder, exist_ok=True)
 
 # Save name in a text file
-with open(os.path.join(user_folder, "info.txt"), "w") as file:
-    file.write(f"Name: {name}\n")
+fd = os.open(os.path.join(user_folder, "info.txt"), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+try:
+    os.write(fd, f"Name: {name}\n".encode("utf-8"))
+finally:
+    os.close(fd)
 
 # Copy the profile picture to the user's folder
 if os.path.isfile(picture_path):
     picture_name = os.path.basename(picture_path)
-    shutil.copy(picture_path, os.path.join(user_folder, picture_name))
+    copy_picture(picture_path, os.path.join(user_folder, picture_name))
     print(f"✅ Profile saved for {name}! Picture copied to {user_folder}.")
 else:
     print("⚠️ Could not find the picture file. Please check the path and try again.")